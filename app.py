@@ -1,53 +1,191 @@
 from __future__ import annotations
 
+import itertools
 import os
+import queue
+import secrets
 import sqlite3
+import threading
 from datetime import datetime, timezone
-from uuid import uuid4
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from flask import Flask, jsonify, request, g, render_template
+import orjson
+from flask import Flask, Response, jsonify, request, g, stream_with_context
 
 app = Flask(__name__)
+# Run PRAGMA optimize on a connection every N requests (0 disables it)
+app.config.setdefault("DB_OPTIMIZE_EVERY", 1000)
+# fsync policy for commits: EXTRA, FULL, NORMAL (default) or OFF for throwaway DBs
+app.config.setdefault("DB_SYNCHRONOUS", os.environ.get("TASKS_DB_SYNCHRONOUS", "NORMAL").upper())
+# Largest batch POST /tasks/bulk accepts in one request
+app.config.setdefault("BULK_MAX_TASKS", 1000)
+if app.config["DB_SYNCHRONOUS"] not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    raise RuntimeError("TASKS_DB_SYNCHRONOUS must be one of OFF, NORMAL, FULL, EXTRA")
+
+_request_counter = itertools.count(1)
+
+# Idle connections shared by all worker threads: (db path, connection)
+_POOL: "queue.LifoQueue[Tuple[str, sqlite3.Connection]]" = queue.LifoQueue(maxsize=16)
+# DB paths whose schema has been ensured by this process
+_schema_ready: Set[str] = set()
+_schema_lock = threading.Lock()
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+ALLOWED_STATUSES = frozenset({"pending", "running", "done", "failed"})
+# Sorted once for error messages instead of on every bad request
+ALLOWED_STATUSES_SORTED = sorted(ALLOWED_STATUSES)
+
+# SQL used on the request path. Keeping each statement in one constant means
+# every call passes the same string, so sqlite3's per-connection statement
+# cache always hits and nothing is re-parsed.
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (id, name, job_type, created_by, status, payload, result, error, created_at, updated_at)
+    VALUES (:id, :name, :job_type, :created_by, :status, :payload, :result, :error, :created_at, :updated_at)
+    """
+SQL_SELECT_BY_ID = "SELECT * FROM tasks WHERE id = ?"
+# The list view leaves out the (potentially large) payload/result/error
+# columns unless the client asks for them with ?include=payload
+TASK_SUMMARY_COLUMNS = "id, name, job_type, created_by, status, created_at, updated_at"
+SQL_LIST_TASKS = f"SELECT {TASK_SUMMARY_COLUMNS} FROM tasks ORDER BY created_at DESC"
+SQL_LIST_TASKS_BY_STATUS = (
+    f"SELECT {TASK_SUMMARY_COLUMNS} FROM tasks WHERE status = ? ORDER BY created_at DESC"
+)
+SQL_LIST_TASKS_FULL = "SELECT * FROM tasks ORDER BY created_at DESC"
+SQL_LIST_TASKS_FULL_BY_STATUS = "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC"
+SQL_UPDATE_DONE = """
+    UPDATE tasks
+    SET status = ?, result = ?, error = NULL, updated_at = ?
+    WHERE id = ?
+    """
+SQL_UPDATE_FAILED = """
+    UPDATE tasks
+    SET status = ?, error = ?, result = NULL, updated_at = ?
+    WHERE id = ?
+    """
+SQL_UPDATE_OTHER = """
+    UPDATE tasks
+    SET status = ?, result = NULL, error = NULL, updated_at = ?
+    WHERE id = ?
+    """
+SQL_UPDATE_DONE_RETURNING = SQL_UPDATE_DONE + " RETURNING *"
+SQL_UPDATE_FAILED_RETURNING = SQL_UPDATE_FAILED + " RETURNING *"
+SQL_UPDATE_OTHER_RETURNING = SQL_UPDATE_OTHER + " RETURNING *"
+SQL_DELETE_BY_ID = "DELETE FROM tasks WHERE id = ?"
+
+# PATCH /tasks/<id> parameter builders: (status, result, error, now, task_id)
+# -> (UPDATE params, stored result, stored error). Each status derives its own
+# columns, so update_task never branches on the status itself.
+_UpdateParams = Tuple[Tuple[Any, ...], Optional[str], Optional[str]]
+
+
+def _done_params(status: str, result: Any, error: Any, now: str, task_id: str) -> _UpdateParams:
+    result_str = None if result is None else str(result)
+    return (status, result_str, now, task_id), result_str, None
+
+
+def _failed_params(status: str, result: Any, error: Any, now: str, task_id: str) -> _UpdateParams:
+    error_str = error.strip()
+    return (status, error_str, now, task_id), None, error_str
+
+
+def _other_params(status: str, result: Any, error: Any, now: str, task_id: str) -> _UpdateParams:
+    return (status, now, task_id), None, None
 
-ALLOWED_STATUSES = {"pending", "running", "done", "failed"}
+
+# status -> (UPDATE, UPDATE ... RETURNING, parameter builder)
+_UpdateSpec = Tuple[str, str, Callable[[str, Any, Any, str, str], _UpdateParams]]
+_UPDATE_DISPATCH: Dict[str, _UpdateSpec] = {
+    "done": (SQL_UPDATE_DONE, SQL_UPDATE_DONE_RETURNING, _done_params),
+    "failed": (SQL_UPDATE_FAILED, SQL_UPDATE_FAILED_RETURNING, _failed_params),
+}
+_UPDATE_OTHER: _UpdateSpec = (SQL_UPDATE_OTHER, SQL_UPDATE_OTHER_RETURNING, _other_params)
+
+# Prepared statements kept per connection; pinned so it comfortably holds
+# every statement above regardless of the Python version's default.
+STATEMENT_CACHE_SIZE = 128
+
+# Rows pulled from SQLite per chunk while streaming GET /tasks
+LIST_FETCH_SIZE = 256
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 #standarise error response in json
-def make_error(message: str, status_code: int = 400):
+def make_error(message: str, status_code: int = 400) -> Tuple[Response, int]:
     return jsonify({"error": message}), status_code
 
+#serialize with orjson (much faster than jsonify for large lists)
+def json_response(obj: Any, status_code: int = 200) -> Response:
+    return app.response_class(orjson.dumps(obj), status=status_code, mimetype="application/json")
+
+#random 128-bit task id as 32 hex chars (cheaper than formatting a uuid4)
+def new_task_id() -> str:
+    return secrets.token_hex(16)
+
+
+def _nonempty_str(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+#parse the JSON body; None for an empty or malformed body.
+#Uses Flask's stdlib parser, which keeps big integers exact and accepts NaN.
+def read_json_body() -> Any:
+    if request.content_length == 0:
+        return None
+    return request.get_json(silent=True)
+
+# Bump when ensure_schema gains a new migration step (stored in PRAGMA user_version)
+SCHEMA_VERSION = 2
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
 #ensure the tasks table exists
 def ensure_schema(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS tasks (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            job_type TEXT,
-            created_by TEXT,
-            status TEXT NOT NULL,
-            payload TEXT,
-            result TEXT,
-            error TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+    # Up-to-date databases cost a single integer read
+    if _schema_version(conn) >= SCHEMA_VERSION:
+        return
+
+    # All DDL runs in one transaction (DDL is transactional in SQLite), so a
+    # first-boot migration costs a single commit. IMMEDIATE also stops two
+    # workers starting at once from migrating concurrently.
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if _schema_version(conn) >= SCHEMA_VERSION:
+            return  # another worker migrated while we waited for the lock
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                job_type TEXT,
+                created_by TEXT,
+                status TEXT NOT NULL,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
         )
-        """
-    )
-    conn.commit()
 
-    # Lightweight migration for existing DBs (adds missing columns)
-    #cols = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+        # Lightweight migration for existing DBs (adds missing columns)
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(tasks)").fetchall()}
+        if "job_type" not in cols:
+            conn.execute("ALTER TABLE tasks ADD COLUMN job_type TEXT")
+        if "created_by" not in cols:
+            conn.execute("ALTER TABLE tasks ADD COLUMN created_by TEXT")
 
-    #if "job_type" not in cols:
-      #  conn.execute("ALTER TABLE tasks ADD COLUMN job_type TEXT")
-    #if "created_by" not in cols:
-     #   conn.execute("ALTER TABLE tasks ADD COLUMN created_by TEXT")
-    #conn.commit()
+        # Serve the list endpoint (optionally filtered by status) in index order
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at DESC)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at DESC)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def get_db_path() -> str:
@@ -58,26 +196,103 @@ def get_db_path() -> str:
     return os.environ.get("TASKS_DB_PATH", "tasks.db")
 
 
+def is_memory_db(path: str) -> bool:
+    return path == ":memory:" or "mode=memory" in path or path.startswith("file::memory:")
+
+
+#each connection to a private (non shared-cache) memory DB is its own database
+def is_private_memory_db(path: str) -> bool:
+    return is_memory_db(path) and "cache=shared" not in path
+
+#tune the connection for a concurrent web workload
+def configure_connection(conn: sqlite3.Connection, path: str) -> None:
+    # WAL lets readers proceed while a writer holds the lock; it is not
+    # available (nor useful) for in-memory databases.
+    if not is_memory_db(path):
+        conn.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable under WAL except for the last commits on power loss
+    conn.execute(f"PRAGMA synchronous={app.config['DB_SYNCHRONOUS']}")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+def _new_conn(path: str) -> sqlite3.Connection:
+    # A pooled connection moves between threads, but only ever serves one
+    # request at a time, so the same-thread check can be relaxed.
+    # uri=True also accepts "file:...?mode=memory&cache=shared" style paths
+    conn = sqlite3.connect(
+        path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE, uri=True
+    )
+    conn.row_factory = sqlite3.Row
+    configure_connection(conn, path)
+    # init_db only covers the first connection per path; a private memory DB
+    # starts empty on every connection, so give each one its own schema
+    if is_private_memory_db(path):
+        ensure_schema(conn)
+    return conn
+
+
+def _checkout(path: str) -> sqlite3.Connection:
+    if path not in _schema_ready:
+        init_db(path)
+    while True:
+        try:
+            pooled_path, conn = _POOL.get_nowait()
+        except queue.Empty:
+            return _new_conn(path)
+        if pooled_path == path:
+            return conn
+        # DB path changed (e.g. tests); drop stale connections
+        conn.close()
+
+
 def get_db() -> sqlite3.Connection:
     """
-    One SQLite connection per request (stored in Flask g).
-    Ensures schema exists for whichever DB path is active.
+    One SQLite connection per request (stored in Flask g), checked out of
+    a process-wide pool so connection setup is paid once, not per request.
     """
     if "db" not in g:
-        conn = sqlite3.connect(get_db_path())
-        conn.row_factory = sqlite3.Row
-        ensure_schema(conn)
-        g.db = conn
+        path = get_db_path()
+        g.db_path = path
+        g.db = _checkout(path)
     return g.db
 
 
-@app.teardown_appcontext
-def close_db(_exc):
-    conn = g.pop("db", None)
-    if conn is not None:
+def init_db(path: Optional[str] = None) -> None:
+    """
+    Create/migrate the schema once per DB path and process.
+    Called lazily by the first checkout for a path, so importing the app
+    never touches the database (and /health works even if the DB can't open).
+    """
+    path = path or get_db_path()
+    with _schema_lock:
+        if path in _schema_ready:
+            return
+        conn = _new_conn(path)
+        ensure_schema(conn)
+        _schema_ready.add(path)
+    # keep the warmed-up connection for the first request
+    try:
+        _POOL.put_nowait((path, conn))
+    except queue.Full:
         conn.close()
 
 
+@app.teardown_appcontext
+def close_db(_exc: Optional[BaseException]) -> None:
+    conn = g.pop("db", None)
+    if conn is not None:
+        # never hand a half-finished transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+        every = app.config["DB_OPTIMIZE_EVERY"]
+        if every and next(_request_counter) % every == 0:
+            conn.execute("PRAGMA optimize")
+        try:
+            _POOL.put_nowait((g.pop("db_path"), conn))
+        except queue.Full:
+            conn.close()
 
 
 def row_to_task(row: sqlite3.Row) -> Dict[str, Any]:
@@ -95,14 +310,78 @@ def row_to_task(row: sqlite3.Row) -> Dict[str, Any]:
     }
 
 
+# Bodies of the static endpoints are built once; each request only wraps them
+# in a new (cheap) Response object, since Flask may modify it per request
+HEALTH_BODY = orjson.dumps({"status": "ok"})
+
+
+# (compiled template, its rendered output) for the home page
+_home_cache: Tuple[Any, str] = (None, "")
+
+
+#index.html is a static page: it takes no context, so it is rendered straight
+#from the Jinja environment (no context processors / template_rendered signal)
+#and re-rendered only when Jinja hands back a new template, e.g. after an
+#auto-reload (TEMPLATES_AUTO_RELOAD or debug mode)
+def _home_html() -> str:
+    global _home_cache
+    template = app.jinja_env.get_template("index.html")
+    cached_template, html = _home_cache
+    if cached_template is not template:
+        html = template.render()
+        _home_cache = (template, html)
+    return html
+
+
 @app.get("/")
 def home():
-    return render_template("index.html")
+    return app.response_class(_home_html(), status=200, mimetype="text/html")
 
 
 @app.get("/health")
 def health():
-    return jsonify(status="ok"), 200
+    return app.response_class(HEALTH_BODY, status=200, mimetype="application/json")
+
+
+# (field, required, error message) for the string fields of a new task
+_TASK_FIELDS: Tuple[Tuple[str, bool, str], ...] = (
+    ("name", True, "Field 'name' is required and must be a non-empty string"),
+    ("job_type", False, "Field 'job_type', if provided, must be a non-empty string"),
+    ("created_by", False, "Field 'created_by' must be a non-empty string if provided"),
+)
+
+
+#validate a task body and build the row to insert (or return an error message)
+def build_task(data: Any, now: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    if not isinstance(data, dict):
+        return None, "Task must be a JSON object"
+
+    task: Dict[str, Any] = {"id": new_task_id()}
+    # One generic check per field; each value is stripped exactly once
+    for field, required, message in _TASK_FIELDS:
+        value = data.get(field)
+        if value is None and not required:
+            task[field] = None
+            continue
+        if not isinstance(value, str):
+            return None, message
+        value = value.strip()
+        if not value:
+            return None, message
+        task[field] = value
+
+    # Store payload/result/error as strings for simplicity (dependency-free).
+    # If payload is JSON, we'll store it as a string representation.
+    payload = data.get("payload")
+    task.update(
+        status="pending",
+        payload=None if payload is None else str(payload),
+        result=None,
+        error=None,
+        created_at=now,
+        updated_at=now,
+    )
+    return task, None
 
 
 @app.post("/tasks")
@@ -110,41 +389,52 @@ def create_task():
     if not request.is_json:
         return make_error("Request body must be JSON", 400)
 
-    data = request.get_json(silent=True) or {}
-    name = data.get("name")
-    job_type = data.get("job_type")
-    created_by = data.get("created_by")
-    payload = data.get("payload")
+    data = read_json_body() or {}
+    task, error = build_task(data, utc_now_iso())
+    if error is not None:
+        return make_error(error, 400)
 
-    if not isinstance(name, str) or not name.strip():
-        return make_error("Field 'name' is required and must be a non-empty string", 400)
-    
-    if job_type is not None and (not isinstance(job_type, str) or not job_type.strip()):
-        return make_error("Field 'job_type', if provided, must be a non-empty string", 400)
-    
-    if created_by is not None and (not isinstance(created_by, str) or not created_by.strip()):
-        return make_error("Field 'created_by' must be a non-empty string if provided", 400)
-    
-    task_id = str(uuid4())
-    now = utc_now_iso()
+    db = get_db()
+    db.execute(SQL_INSERT_TASK, task)
+    db.commit()
 
-    # Store payload/result/error as strings for simplicity (dependency-free).
-    # If payload is JSON, we'll store it as a string representation.
-    payload_str = None if payload is None else str(payload)
+    # The stored row is exactly what we just inserted; no need to read it back
+    return jsonify(task), 201
+
+
+@app.post("/tasks/bulk")
+def create_tasks_bulk():
+    """
+    Create many tasks from a JSON array in one transaction (one commit/fsync).
+    The whole batch is rejected if any task is invalid.
+    """
+    if not request.is_json:
+        return make_error("Request body must be JSON", 400)
+
+    data = read_json_body()
+    if not isinstance(data, list) or not data:
+        return make_error("Request body must be a non-empty JSON array of tasks", 400)
+    if len(data) > app.config["BULK_MAX_TASKS"]:
+        return make_error(f"At most {app.config['BULK_MAX_TASKS']} tasks per request", 413)
+
+    now = utc_now_iso()
+    tasks: List[Dict[str, Any]] = []
+    for index, item in enumerate(data):
+        task, error = build_task(item, now)
+        if error is not None:
+            return make_error(f"Task {index}: {error}", 400)
+        tasks.append(task)
 
     db = get_db()
-    db.execute(
-        """
-        INSERT INTO tasks (id, name, job_type, created_by, status, payload, result, error, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        
-        (task_id, name.strip(), job_type.strip() if isinstance(job_type, str) else None, created_by.strip() if isinstance(created_by, str) else None, "pending", payload_str, None, None, now, now),
-    )
+    # Take the write lock up front so the batch never fails half-way on a busy
+    # DB, then bind every row to the one cached INSERT (one parse, one commit).
+    # executemany binds 10 parameters per row, so SQLite's variable limit
+    # never applies regardless of batch size.
+    db.execute("BEGIN IMMEDIATE")
+    db.executemany(SQL_INSERT_TASK, tasks)
     db.commit()
 
-    created = db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
-    return jsonify(row_to_task(created)), 201
+    return json_response(tasks, 201)
 
 
 @app.get("/tasks")
@@ -152,26 +442,42 @@ def list_tasks():
     status = request.args.get("status")
 
     if status is not None and status not in ALLOWED_STATUSES:
-        return make_error(f"Invalid status filter. Allowed: {sorted(ALLOWED_STATUSES)}", 400)
+        return make_error(f"Invalid status filter. Allowed: {ALLOWED_STATUSES_SORTED}", 400)
+
+    include = {part.strip() for part in request.args.get("include", "").split(",")}
+    full = "payload" in include
 
     db = get_db()
     if status is None:
-        rows = db.execute(
-            "SELECT * FROM tasks ORDER BY created_at DESC"
-        ).fetchall()
+        cursor = db.execute(SQL_LIST_TASKS_FULL if full else SQL_LIST_TASKS)
     else:
-        rows = db.execute(
-            "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC",
-            (status,),
-        ).fetchall()
-
-    return jsonify([row_to_task(r) for r in rows]), 200
+        cursor = db.execute(SQL_LIST_TASKS_FULL_BY_STATUS if full else SQL_LIST_TASKS_BY_STATUS, (status,))
+
+    # Encode rows chunk by chunk instead of building the whole list in memory
+    def generate() -> Iterator[bytes]:
+        try:
+            yield b"["
+            first = True
+            while True:
+                rows = cursor.fetchmany(LIST_FETCH_SIZE)
+                if not rows:
+                    break
+                if not first:
+                    yield b","
+                yield b",".join(orjson.dumps(dict(r)) for r in rows)
+                first = False
+            yield b"]"
+        finally:
+            cursor.close()
+
+    # stream_with_context keeps the pooled connection checked out until done
+    return Response(stream_with_context(generate()), status=200, mimetype="application/json")
 
 
 @app.get("/tasks/<task_id>")
 def get_task(task_id: str):
     db = get_db()
-    row = db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    row = db.execute(SQL_SELECT_BY_ID, (task_id,)).fetchone()
     if row is None:
         return make_error("Task not found", 404)
     return jsonify(row_to_task(row)), 200
@@ -182,65 +488,53 @@ def update_task(task_id: str):
     if not request.is_json:
         return make_error("Request body must be JSON", 400)
 
-    data = request.get_json(silent=True) or {}
+    data = read_json_body()
+    if not isinstance(data, dict):
+        data = {}
     status = data.get("status")
     result = data.get("result")
-    error = data.get("error")
+    error: Any = data.get("error")
 
     if status is None:
         return make_error("Field 'status' is required", 400)
-    if status not in ALLOWED_STATUSES:
-        return make_error(f"Invalid status. Allowed: {sorted(ALLOWED_STATUSES)}", 400)
+    # check the type first: unhashable values can't be looked up in a frozenset
+    if not isinstance(status, str) or status not in ALLOWED_STATUSES:
+        return make_error(f"Invalid status. Allowed: {ALLOWED_STATUSES_SORTED}", 400)
 
-    if status == "failed" and (not isinstance(error, str) or not error.strip()):
+    if status == "failed" and not _nonempty_str(error):
         return make_error("Field 'error' is required when status is 'failed'", 400)
 
+    # Simple state rules: only 'done' keeps a result, only 'failed' an error
+    now = utc_now_iso()
+    sql, sql_returning, build_params = _UPDATE_DISPATCH.get(status, _UPDATE_OTHER)
+    params, result_str, error_str = build_params(status, result, error, now, task_id)
+
     db = get_db()
-    existing = db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    if SQLITE_HAS_RETURNING:
+        # One statement applies the change, checks existence and returns the row
+        updated_row = db.execute(sql_returning, params).fetchone()
+        db.commit()
+        if updated_row is None:
+            return make_error("Task not found", 404)
+        return jsonify(dict(updated_row)), 200
+
+    existing = db.execute(SQL_SELECT_BY_ID, (task_id,)).fetchone()
     if existing is None:
         return make_error("Task not found", 404)
 
-    now = utc_now_iso()
-
-    # Simple state rules
-    if status == "done":
-        result_str = None if result is None else str(result)
-        db.execute(
-            """
-            UPDATE tasks
-            SET status = ?, result = ?, error = NULL, updated_at = ?
-            WHERE id = ?
-            """,
-            (status, result_str, now, task_id),
-        )
-    elif status == "failed":
-        db.execute(
-            """
-            UPDATE tasks
-            SET status = ?, error = ?, result = NULL, updated_at = ?
-            WHERE id = ?
-            """,
-            (status, error.strip(), now, task_id),
-        )
-    else:
-        db.execute(
-            """
-            UPDATE tasks
-            SET status = ?, result = NULL, error = NULL, updated_at = ?
-            WHERE id = ?
-            """,
-            (status, now, task_id),
-        )
-
+    db.execute(sql, params)
     db.commit()
-    updated = db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
-    return jsonify(row_to_task(updated)), 200
+
+    # Build the response from the pre-update row plus the applied delta
+    updated = dict(existing)
+    updated.update(status=status, result=result_str, error=error_str, updated_at=now)
+    return jsonify(updated), 200
 
 
 @app.delete("/tasks/<task_id>")
 def delete_task(task_id: str):
     db = get_db()
-    cur = db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    cur = db.execute(SQL_DELETE_BY_ID, (task_id,))
     db.commit()
 
     if cur.rowcount == 0:
@@ -248,5 +542,10 @@ def delete_task(task_id: str):
 
     return ("", 204)
 
+# Development server only. In production run threaded gunicorn workers so
+# reads overlap with writes under WAL (this is what the Docker image does):
+#   gunicorn -b 0.0.0.0:8080 -k gthread -w 2 --threads 8 app:app
+# Keep total threads well below ~100; busy_timeout makes writers wait for
+# the lock instead of failing with "database is locked".
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8080)
+    app.run(host="0.0.0.0", port=8080, threaded=True)
@@ -1,12 +1,15 @@
 import os
-import tempfile
+import sqlite3
 # pyright: reportUnusedImport=false
 
-# Create a temporary file-based SQLite DB for tests
-_tmpdir = tempfile.TemporaryDirectory()
-os.environ["TASKS_DB_PATH"] = os.path.join(_tmpdir.name, "testtasks.db")
+# Keep the test DB in RAM: a named, shared-cache in-memory SQLite database
+# that every pooled connection sees. This must be set before `app` is imported.
+os.environ["TASKS_DB_PATH"] = "file:testtasks?mode=memory&cache=shared"
+
+# An in-memory DB is dropped when its last connection closes; hold one open
+# for the whole session.
+_keepalive = sqlite3.connect(os.environ["TASKS_DB_PATH"], uri=True)
 
 
 # TEMPORARY: view test DB for inspection in local file
 #os.environ["TASKS_DB_PATH"] = "test_tasks_debug.db"
-
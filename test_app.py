@@ -134,3 +134,237 @@ def test_filter_tasks_by_status():
     tasks2 = resp2.get_json()
     assert len(tasks2) == 1
     assert tasks2[0]["id"] == t2
+
+
+def test_file_db_uses_wal_journal_mode(tmp_path):
+    # the test suite runs in memory, so check WAL against a real file
+    from app import _new_conn
+    conn = _new_conn(str(tmp_path / "wal.db"))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+def test_db_connection_is_reused_across_requests():
+    with app.app_context():
+        from app import get_db
+        first = get_db()
+    with app.app_context():
+        second = get_db()
+    assert first is second
+
+
+def test_list_queries_use_indexes():
+    with app.app_context():
+        from app import get_db, SQL_LIST_TASKS, SQL_LIST_TASKS_BY_STATUS
+        db = get_db()
+        filtered = db.execute(
+            "EXPLAIN QUERY PLAN " + SQL_LIST_TASKS_BY_STATUS, ("pending",)
+        ).fetchall()
+        unfiltered = db.execute("EXPLAIN QUERY PLAN " + SQL_LIST_TASKS).fetchall()
+    assert any("idx_tasks_status_created" in row["detail"] for row in filtered)
+    assert any("idx_tasks_created" in row["detail"] for row in unfiltered)
+    assert not any("TEMP B-TREE" in row["detail"] for row in filtered + unfiltered)
+
+
+def test_mutation_responses_match_stored_rows():
+    client = app.test_client()
+    created = client.post("/tasks", json={"name": "sync", "created_by": "ci"}).get_json()
+    assert client.get(f"/tasks/{created['id']}").get_json() == created
+
+    failed = client.patch(f"/tasks/{created['id']}", json={"status": "failed", "error": " boom "}).get_json()
+    assert failed["error"] == "boom"
+    assert client.get(f"/tasks/{created['id']}").get_json() == failed
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_update_task_with_and_without_returning(monkeypatch, has_returning):
+    import app as app_module
+    monkeypatch.setattr(app_module, "SQLITE_HAS_RETURNING", has_returning)
+    client = app.test_client()
+    task_id = client.post("/tasks", json={"name": "report"}).get_json()["id"]
+
+    done = client.patch(f"/tasks/{task_id}", json={"status": "done", "result": "ok"})
+    assert done.status_code == 200
+    assert done.get_json() == client.get(f"/tasks/{task_id}").get_json()
+
+    missing = client.patch("/tasks/not-a-real-id", json={"status": "running"})
+    assert missing.status_code == 404
+
+
+def test_bulk_create_tasks():
+    client = app.test_client()
+    resp = client.post("/tasks/bulk", json=[{"name": "a"}, {"name": "b", "job_type": "backup"}])
+    assert resp.status_code == 201
+    created = resp.get_json()
+    assert [t["name"] for t in created] == ["a", "b"]
+    assert all(t["status"] == "pending" for t in created)
+
+    listed = {t["id"] for t in client.get("/tasks").get_json()}
+    assert listed == {t["id"] for t in created}
+
+
+def test_bulk_create_rejects_whole_batch_on_invalid_task():
+    client = app.test_client()
+    resp = client.post("/tasks/bulk", json=[{"name": "ok"}, {"name": ""}])
+    assert resp.status_code == 400
+    assert "Task 1" in resp.get_json()["error"]
+    assert client.get("/tasks").get_json() == []
+
+    assert client.post("/tasks/bulk", json=[]).status_code == 400
+    assert client.post("/tasks/bulk", json={"name": "x"}).status_code == 400
+
+
+def test_list_tasks_omits_payload_unless_included(monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "LIST_FETCH_SIZE", 2)
+    client = app.test_client()
+    client.post("/tasks/bulk", json=[{"name": f"t{i}", "payload": {"i": i}} for i in range(5)])
+
+    summary = client.get("/tasks").get_json()
+    assert len(summary) == 5
+    assert all("payload" not in t and "result" not in t for t in summary)
+
+    full = client.get("/tasks?include=payload").get_json()
+    assert len(full) == 5
+    assert all(t["payload"] is not None and "error" in t for t in full)
+
+
+def test_malformed_or_non_object_json_bodies_return_400():
+    client = app.test_client()
+    task_id = client.post("/tasks", json={"name": "x"}).get_json()["id"]
+
+    for body in ("{not json", "[1, 2]", ""):
+        created = client.post("/tasks", data=body, content_type="application/json")
+        assert created.status_code == 400
+        patched = client.patch(f"/tasks/{task_id}", data=body, content_type="application/json")
+        assert patched.status_code == 400
+
+    for status in ([1], {"a": 1}, 3):
+        patched = client.patch(f"/tasks/{task_id}", json={"status": status})
+        assert patched.status_code == 400
+        assert "Invalid status" in patched.get_json()["error"]
+
+
+@pytest.mark.parametrize("body", [
+    {},
+    {"name": "   "},
+    {"name": 42},
+    {"name": "ok", "job_type": ""},
+    {"name": "ok", "created_by": ["me"]},
+])
+def test_create_task_rejects_invalid_fields(body):
+    client = app.test_client()
+    resp = client.post("/tasks", json=body)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def test_create_task_strips_string_fields():
+    client = app.test_client()
+    task = client.post("/tasks", json={"name": " n ", "job_type": " j ", "created_by": " c "}).get_json()
+    assert (task["name"], task["job_type"], task["created_by"]) == ("n", "j", "c")
+
+
+def test_static_endpoints_return_fresh_responses():
+    with app.test_request_context("/"):
+        for view in ("home", "health"):
+            first = app.view_functions[view]()
+            second = app.view_functions[view]()
+            assert first is not second
+            assert first.get_data() == second.get_data()
+
+    client = app.test_client()
+    assert client.get("/").mimetype == "text/html"
+    assert client.get("/health").headers["Content-Type"] == "application/json"
+
+
+def test_ensure_schema_migrates_old_table(tmp_path):
+    from app import _new_conn, ensure_schema
+    conn = _new_conn(str(tmp_path / "old.db"))
+    try:
+        conn.execute(
+            "CREATE TABLE tasks (id TEXT PRIMARY KEY, name TEXT NOT NULL, status TEXT NOT NULL,"
+            " payload TEXT, result TEXT, error TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        conn.commit()
+        ensure_schema(conn)
+        cols = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+        assert {"job_type", "created_by"} <= cols
+        assert not conn.in_transaction
+
+        # once migrated, ensure_schema only reads user_version
+        from app import SCHEMA_VERSION
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        statements = []
+        conn.set_trace_callback(statements.append)
+        ensure_schema(conn)
+        assert statements == ["PRAGMA user_version"]
+    finally:
+        conn.close()
+
+
+def test_bulk_create_enforces_batch_limit(monkeypatch):
+    monkeypatch.setitem(app.config, "BULK_MAX_TASKS", 2)
+    client = app.test_client()
+    resp = client.post("/tasks/bulk", json=[{"name": "a"}, {"name": "b"}, {"name": "c"}])
+    assert resp.status_code == 413
+    assert client.get("/tasks").get_json() == []
+
+
+def test_update_task_clears_result_and_error_on_other_statuses():
+    client = app.test_client()
+    task_id = client.post("/tasks", json={"name": "retry"}).get_json()["id"]
+
+    failed = client.patch(f"/tasks/{task_id}", json={"status": "failed", "error": "oops", "result": "x"}).get_json()
+    assert (failed["error"], failed["result"]) == ("oops", None)
+
+    running = client.patch(f"/tasks/{task_id}", json={"status": "running"}).get_json()
+    assert (running["error"], running["result"]) == (None, None)
+
+
+def test_big_integers_in_body_are_kept_exact():
+    client = app.test_client()
+    created = client.post("/tasks", json={"name": "x", "payload": {"id": 12345678901234567890123}})
+    assert created.status_code == 201
+    assert "12345678901234567890123" in created.get_json()["payload"]
+
+    task_id = created.get_json()["id"]
+    done = client.patch(f"/tasks/{task_id}", json={"status": "done", "result": 98765432109876543210987})
+    assert "98765432109876543210987" in done.get_json()["result"]
+
+
+def test_nan_in_body_is_accepted():
+    client = app.test_client()
+    resp = client.post("/tasks", data='{"name": "x", "payload": NaN}', content_type="application/json")
+    assert resp.status_code == 201
+
+
+def test_schema_is_created_lazily_for_a_new_db_path(tmp_path, monkeypatch):
+    db_file = tmp_path / "lazy.db"
+    monkeypatch.setenv("TASKS_DB_PATH", str(db_file))
+    assert not db_file.exists()
+
+    client = app.test_client()
+    assert client.get("/health").status_code == 200
+    assert not db_file.exists()
+
+    assert client.post("/tasks", json={"name": "lazy"}).status_code == 201
+    assert db_file.exists()
+
+
+def test_private_memory_db_gives_every_connection_a_schema(monkeypatch):
+    from app import get_db, build_task, SQL_INSERT_TASK
+    monkeypatch.setenv("TASKS_DB_PATH", ":memory:")
+    with app.app_context():
+        first = get_db()
+        # a second, overlapping request checks out a separate connection
+        with app.app_context():
+            second = get_db()
+            assert second is not first
+            for db in (first, second):
+                task, _ = build_task({"name": "mem"}, "2024-01-01T00:00:00+00:00")
+                db.execute(SQL_INSERT_TASK, task)
+                db.commit()
+                assert db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1